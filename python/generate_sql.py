@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 import json
+import re
 import sys
-from typing import Dict, List, Union, Any, Optional
+from typing import Callable, Dict, List, Union, Any, Optional
 
 # Type definitions for clarity
 QueryNode = Dict[str, Any]
@@ -9,6 +10,23 @@ GroupNode = Dict[str, Any]
 RuleNode = Dict[str, Any]
 JSONValue = Union[str, int, float, bool, None, Dict[str, Any], List[Any]]
 
+# Translation table doubling single quotes in SQL string literals
+_QUOTE_TABLE = str.maketrans({"'": "''"})
+
+# As above, also escaping LIKE wildcards and the escape character itself
+_LIKE_TABLE = str.maketrans({"'": "''", "!": "!!", "%": "!%", "_": "!_"})
+
+# Declares the escape used above; "!" rather than a backslash, which MySQL's
+# default sql_mode treats as a string escape inside the literal
+_LIKE_ESCAPE = " ESCAPE '!'"
+
+# Item types of IN lists that can be formatted without per-item dispatch
+_NUMBER_TYPES = frozenset({int, float})
+_STRING_TYPES = frozenset({str})
+
+# Placeholder emitted for a value slot while compiling a tree
+_SLOT_PATTERN = re.compile(r"\x00(\d+)\x00")
+
 
 class SQLGenerator:
     """Generates SQL expressions from react-awesome-query-builder JSON trees."""
@@ -38,6 +56,15 @@ class SQLGenerator:
         "OR": "OR"
     }
 
+    # Operators needing special handling, grouped by how they are rendered
+    _NULL_OPS = frozenset({"is_null", "is_not_null"})
+    _EMPTY_OPS = frozenset({"is_empty", "is_not_empty"})
+    _BETWEEN_OPS = frozenset({"between", "not_between"})
+    _IN_OPS = frozenset({"in", "not_in"})
+
+    # Node types that produce a condition
+    _NODE_TYPES = frozenset({"rule", "group"})
+
     def __init__(self, use_params: bool = False):
         """
         Initialize the SQL generator.
@@ -48,6 +75,7 @@ class SQLGenerator:
         self.use_params = use_params
         self.params = []
         self.param_index = 0
+        self._fmt_cache = {}
 
     def format_value(self, value: JSONValue, value_type: Optional[str] = None) -> str:
         """
@@ -55,33 +83,102 @@ class SQLGenerator:
         
         Args:
             value: The value to format
-            value_type: The type of the value from the query builder
+            value_type: The type of the value from the query builder, already
+                unwrapped from the rule's valueType list
             
         Returns:
             Formatted SQL value
         """
+        # Unwrap single-item arrays (in a loop, they may be nested)
+        value_cls = type(value)
+        while value_cls is list and len(value) == 1:
+            value = value[0]
+            value_cls = type(value)
+            
         if value is None:
             return "NULL"
         
         # Handle arrays of values
-        if isinstance(value, list):
-            if len(value) == 1:
-                return self.format_value(value[0], value_type[0] if isinstance(value_type, list) else value_type)
-            return "(" + ", ".join(self.format_value(v) for v in value) + ")"
-        
-        # Get effective value type
-        effective_type = value_type
-        if isinstance(value_type, list) and len(value_type) == 1:
-            effective_type = value_type[0]
+        if value_cls is list:
+            return self._format_list(value)
+        
+        # Floats bypass the cache: 0.0 and -0.0 compare equal but render
+        # differently, and formatting one costs no more than a key would
+        if value_cls is float:
+            return self._format_scalar(value, value_type)
             
-        # Format based on type
-        if effective_type == "string" or isinstance(value, str):
+        # Reuse the formatting of literals repeated within a query; the type
+        # is part of the key so that True and 1 stay distinct
+        try:
+            key = (value_cls, value, value_type)
+            return self._fmt_cache[key]
+        except KeyError:
+            formatted = self._fmt_cache[key] = self._format_scalar(value, value_type)
+            return formatted
+        except TypeError:
+            # Unhashable value (e.g. a dict), format without caching
+            return self._format_scalar(value, value_type)
+
+    def _format_list(self, value: List[JSONValue]) -> str:
+        """
+        Format an array of values as a parenthesized SQL list.
+        
+        Nested arrays are handled with an explicit stack rather than by
+        recursing, so no input depth can exhaust the Python stack. The stack
+        holds (is_text, item) pairs: values still to be formatted and literal
+        separators or closing parens.
+        """
+        out = []
+        stack = [(False, value)]
+        
+        while stack:
+            is_text, item = stack.pop()
+            if is_text:
+                out.append(item)
+                continue
+                
+            item_cls = type(item)
+            while item_cls is list and len(item) == 1:
+                item = item[0]
+                item_cls = type(item)
+            if item_cls is not list:
+                out.append(self.format_value(item))
+                continue
+                
+            # Format homogeneous lists in one pass instead of a call per item
+            item_types = set(map(type, item))
+            if item_types <= _NUMBER_TYPES:
+                out += ("(", ", ".join(map(str, item)), ")")
+                continue
+            if item_types == _STRING_TYPES:
+                out += ("('", "', '".join([v.translate(_QUOTE_TABLE) for v in item]), "')")
+                continue
+                
+            out.append("(")
+            stack.append((True, ")"))
+            for i in range(len(item) - 1, -1, -1):
+                stack.append((False, item[i]))
+                if i:
+                    stack.append((True, ", "))
+                    
+        return "".join(out)
+
+    def _format_scalar(self, value: JSONValue, effective_type: Optional[str]) -> str:
+        """Format a single non-null value based on its type."""
+        # Exact type() checks are cheaper than isinstance for the JSON built-ins;
+        # isinstance is only reached for subclasses
+        value_cls = type(value)
+        if effective_type == "string" or value_cls is str:
             # Escape single quotes by doubling them
-            escaped_value = str(value).replace("'", "''")
+            escaped_value = str(value).translate(_QUOTE_TABLE)
             return f"'{escaped_value}'"
-        elif effective_type == "number" or isinstance(value, (int, float)):
+        elif value_cls is bool:
+            # Checked before numbers since bool is an int subclass
+            return "TRUE" if value else "FALSE"
+        elif (effective_type == "number" or value_cls is int or value_cls is float
+              or isinstance(value, (int, float))):
             return str(value)
-        elif effective_type == "boolean" or isinstance(value, bool):
+        elif effective_type == "boolean":
             return "TRUE" if value else "FALSE"
         elif effective_type in ("date", "datetime"):
             return f"DATE '{value}'"
@@ -89,7 +186,7 @@ class SQLGenerator:
             return f"'{value}'"
         else:
             # Default stringification
-            return f"'{str(value).replace('\'', '\'\'')}'"
+            return f"'{str(value).translate(_QUOTE_TABLE)}'"
 
     def add_param(self, value: JSONValue) -> str:
         """
@@ -105,61 +202,140 @@ class SQLGenerator:
         self.params.append(value)
         return f"${self.param_index}"
 
-    def process_rule(self, rule: RuleNode) -> str:
+    def _handle_unary(self, out: List[str], field: str, operator: str, value: JSONValue, value_type: Optional[str]) -> None:
+        """Handle operators that take no value (IS NULL, = '', ...)."""
+        out += (field, " ", self.OPERATOR_MAPPING[operator])
+
+    def _handle_between(self, out: List[str], field: str, operator: str, value: JSONValue, value_type: Optional[str]) -> None:
+        """Handle BETWEEN / NOT BETWEEN with a low and high bound."""
+        if not (isinstance(value, list) and len(value) >= 2):
+            self._handle_binary(out, field, operator, value, value_type)
+            return
+        out += (field, " ", self.OPERATOR_MAPPING[operator], " ",
+                self.format_value(value[0], value_type), " AND ",
+                self.format_value(value[1], value_type))
+
+    def _handle_in(self, out: List[str], field: str, operator: str, value: JSONValue, value_type: Optional[str]) -> None:
+        """Handle IN / NOT IN with a list of values."""
+        out += (field, " ", self.OPERATOR_MAPPING[operator], " ", self.format_value(value, value_type))
+
+    def _quote_like_literal(self, value: JSONValue) -> str:
         """
-        Process a rule node to generate a SQL condition.
+        Render a value for use inside a quoted LIKE pattern.
         
-        Args:
-            rule: The rule node to process
-            
-        Returns:
-            SQL condition string
+        Single quotes are doubled and the LIKE wildcards (and the "!" escape
+        character itself) are escaped, so the value matches literally given
+        the ESCAPE clause the handlers append.
         """
+        return str(value).translate(_LIKE_TABLE)
+
+    def _handle_starts_with(self, out: List[str], field: str, operator: str, value: JSONValue, value_type: Optional[str]) -> None:
+        """Handle starts_with as a LIKE with a trailing wildcard."""
+        pattern = self._quote_like_literal(value[0] if isinstance(value, list) else value)
+        out += (field, " LIKE '", pattern, "%'", _LIKE_ESCAPE)
+
+    def _handle_ends_with(self, out: List[str], field: str, operator: str, value: JSONValue, value_type: Optional[str]) -> None:
+        """Handle ends_with as a LIKE with a leading wildcard."""
+        pattern = self._quote_like_literal(value[0] if isinstance(value, list) else value)
+        out += (field, " LIKE '%", pattern, "'", _LIKE_ESCAPE)
+
+    def _handle_binary(self, out: List[str], field: str, operator: str, value: JSONValue, value_type: Optional[str]) -> None:
+        """Handle regular binary operators (=, <, LIKE, ...)."""
+        formatted_value = self.format_value(value[0] if isinstance(value, list) else value, value_type)
+        out += (field, " ", self.OPERATOR_MAPPING[operator], " ", formatted_value)
+
+    # Operator -> handler dispatch; anything not listed is a binary operator
+    _HANDLERS = {
+        **dict.fromkeys(_NULL_OPS | _EMPTY_OPS, _handle_unary),
+        **dict.fromkeys(_BETWEEN_OPS, _handle_between),
+        **dict.fromkeys(_IN_OPS, _handle_in),
+        "starts_with": _handle_starts_with,
+        "ends_with": _handle_ends_with,
+    }
+
+    def _emit_rule(self, rule: RuleNode, out: List[str]) -> None:
+        """Append the SQL fragments for a rule node to the output buffer."""
         props = rule["properties"]
         operator = props["operator"]
         field = props["field"]
+        # Function fields are dicts; render them as the f-strings used to
+        field = field if type(field) is str else str(field)
         
-        # Handle special operators
-        if operator in ("is_null", "is_not_null"):
-            return f"{field} {self.OPERATOR_MAPPING[operator]}"
-            
-        if operator in ("is_empty", "is_not_empty"):
-            return f"{field} {self.OPERATOR_MAPPING[operator]}"
-            
-        # Extract value and value type
-        value = props["value"]
+        handler = self._HANDLERS.get(operator, SQLGenerator._handle_binary)
+        
+        # Extract value and value type (the value is only optional for unary operators)
+        value = props.get("value") if handler is SQLGenerator._handle_unary else props["value"]
         value_type = props.get("valueType")
+        effective_type = value_type[0] if type(value_type) is list and value_type else value_type
+        
+        handler(self, out, field, operator, value, effective_type)
+
+    def _emit(self, node: QueryNode, out: List[str]) -> None:
+        """
+        Append the SQL fragments for a node to the output buffer.
         
-        # Handle BETWEEN operator
-        if operator in ("between", "not_between") and isinstance(value, list) and len(value) >= 2:
-            low_val = self.format_value(value[0], value_type[0] if isinstance(value_type, list) else value_type)
-            high_val = self.format_value(value[1], value_type[0] if isinstance(value_type, list) else value_type)
-            return f"{field} {self.OPERATOR_MAPPING[operator]} {low_val} AND {high_val}"
+        The tree is walked iteratively with an explicit stack, so deeply
+        nested groups neither pay a Python frame per level nor hit the
+        interpreter recursion limit. The stack holds nodes still to be
+        emitted and literal text (separators, closing parens) to be
+        appended once the preceding nodes are done.
+        
+        Args:
+            node: The rule or group node to emit
+            out: Buffer receiving the SQL fragments
+        """
+        stack = [node]
+        
+        while stack:
+            node = stack.pop()
             
-        # Handle IN operator
-        if operator in ("in", "not_in"):
-            formatted_values = self.format_value(value, value_type)
-            return f"{field} {self.OPERATOR_MAPPING[operator]} {formatted_values}"
+            if type(node) is str:
+                out.append(node)
+                continue
+                
+            if node["type"] == "rule":
+                self._emit_rule(node, out)
+                continue
+                
+            children = node.get("children1", [])
+            if not children:
+                out.append("TRUE")  # Empty group
+                continue
+                
+            props = node.get("properties", {})
+            separator = f" {props.get('conjunction', 'AND')} "
             
-        # Handle LIKE operators with special patterns
-        if operator == "starts_with":
-            formatted_value = self.format_value(value[0] if isinstance(value, list) else value, 
-                                              value_type[0] if isinstance(value_type, list) else value_type)
-            # Remove quotes and add % at the end
-            inner_value = formatted_value[1:-1] + "%"
-            return f"{field} LIKE '{inner_value}'"
+            # Only rule and group children contribute a condition
+            children = [child for child in children
+                        if child["type"] in self._NODE_TYPES]
             
-        if operator == "ends_with":
-            formatted_value = self.format_value(value[0] if isinstance(value, list) else value, 
-                                              value_type[0] if isinstance(value_type, list) else value_type)
-            # Remove quotes and add % at the beginning
-            inner_value = "%" + formatted_value[1:-1]
-            return f"{field} LIKE '{inner_value}'"
+            # Apply negation if necessary
+            if props.get("not", False):
+                out.append("NOT ")
+                
+            # Add parentheses for compound conditions
+            if len(children) > 1:
+                out.append("(")
+                stack.append(")")
+                
+            for i in range(len(children) - 1, -1, -1):
+                stack.append(children[i])
+                if i:
+                    stack.append(separator)
+
+    def process_rule(self, rule: RuleNode) -> str:
+        """
+        Process a rule node to generate a SQL condition.
+        
+        Args:
+            rule: The rule node to process
             
-        # Handle regular binary operators
-        formatted_value = self.format_value(value[0] if isinstance(value, list) else value, 
-                                          value_type[0] if isinstance(value_type, list) else value_type)
-        return f"{field} {self.OPERATOR_MAPPING[operator]} {formatted_value}"
+        Returns:
+            SQL condition string
+        """
+        out = []
+        self._emit_rule(rule, out)
+        return "".join(out)
 
     def process_group(self, group: GroupNode) -> str:
         """
@@ -171,34 +347,9 @@ class SQLGenerator:
         Returns:
             SQL condition string
         """
-        props = group.get("properties", {})
-        conjunction = props.get("conjunction", "AND")
-        negate = props.get("not", False)
-        
-        # Process children
-        children = group.get("children1", [])
-        if not children:
-            return "TRUE"  # Empty group
-            
-        conditions = []
-        for child in children:
-            if child["type"] == "rule":
-                conditions.append(self.process_rule(child))
-            elif child["type"] == "group":
-                conditions.append(self.process_group(child))
-                
-        # Join conditions with the conjunction
-        joined_conditions = f" {conjunction} ".join(conditions)
-        
-        # Add parentheses for compound conditions
-        if len(conditions) > 1:
-            joined_conditions = f"({joined_conditions})"
-            
-        # Apply negation if necessary
-        if negate:
-            joined_conditions = f"NOT {joined_conditions}"
-            
-        return joined_conditions
+        out = []
+        self._emit(group, out)
+        return "".join(out)
 
     def generate_sql(self, query_tree: Dict[str, Any]) -> str:
         """
@@ -210,16 +361,72 @@ class SQLGenerator:
         Returns:
             SQL WHERE clause
         """
-        # Reset params for each query
+        # Reset params and the literal cache for each query
         self.params = []
         self.param_index = 0
+        self._fmt_cache.clear()
         
-        if query_tree["type"] == "group":
-            return self.process_group(query_tree)
-        elif query_tree["type"] == "rule":
-            return self.process_rule(query_tree)
-        else:
+        if query_tree["type"] not in self._NODE_TYPES:
             raise ValueError(f"Unknown node type: {query_tree['type']}")
+            
+        out = []
+        self._emit(query_tree, out)
+        return "".join(out)
+
+    def compile(self, query_tree: Dict[str, Any]) -> Callable[[List[JSONValue]], str]:
+        """
+        Compile a query tree into a specialized SQL-generating function.
+        
+        The tree is walked once; operators, fields and conjunctions are baked
+        into the generated source and every formatted value becomes a slot
+        read from the function's argument. Useful when the same tree shape is
+        rendered many times with different values.
+        
+        Args:
+            query_tree: The query tree JSON
+            
+        Returns:
+            Function taking a list of values, one per slot in tree order (a
+            scalar for comparisons, two for BETWEEN, the whole list for IN),
+            and returning the SQL WHERE clause
+        """
+        slots = []
+        
+        def record_value(value: JSONValue, value_type: Optional[str] = None) -> str:
+            slots.append(f"_fmt(p[{len(slots)}], {value_type!r})")
+            return f"\x00{len(slots) - 1}\x00"
+        
+        def record_like(value: JSONValue) -> str:
+            slots.append(f"_like(p[{len(slots)}])")
+            return f"\x00{len(slots) - 1}\x00"
+        
+        # Route every formatted value through the recorders for this walk
+        self.format_value = record_value
+        self._quote_like_literal = record_like
+        try:
+            template = self.generate_sql(query_tree)
+        finally:
+            del self.format_value
+            del self._quote_like_literal
+        
+        code_parts = []
+        pos = 0
+        for match in _SLOT_PATTERN.finditer(template):
+            if match.start() > pos:
+                code_parts.append(repr(template[pos:match.start()]))
+            code_parts.append(slots[int(match.group(1))])
+            pos = match.end()
+        if pos < len(template) or not code_parts:
+            code_parts.append(repr(template[pos:]))
+        
+        # A flat tuple display; a long chain of + nests too deep for the compiler
+        source = ("def _gen(p):\n"
+                  "    _fmt_cache.clear()\n"
+                  "    return ''.join((" + ", ".join(code_parts) + ",))\n")
+        namespace = {"_fmt": self.format_value, "_like": self._quote_like_literal,
+                     "_fmt_cache": self._fmt_cache}
+        exec(source, namespace)
+        return namespace["_gen"]
 
 
 def main():
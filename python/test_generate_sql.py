@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import unittest
+
+from generate_sql import SQLGenerator
+
+
+def like_rule(operator, value):
+    return {
+        "type": "rule",
+        "properties": {"operator": operator, "field": "name", "value": [value], "valueType": ["text"]},
+    }
+
+
+class LikePatternTest(unittest.TestCase):
+    """starts_with/ends_with values must match literally under the ESCAPE clause."""
+
+    CASES = [
+        ("abc", "abc"),
+        ("O'Brien", "O''Brien"),
+        ("50%", "50!%"),
+        ("a_b", "a!_b"),
+        ("hey!", "hey!!"),
+        ("back\\slash", "back\\slash"),
+        ("'%_!", "''!%!_!!"),
+    ]
+
+    def test_starts_with(self):
+        for value, pattern in self.CASES:
+            with self.subTest(value=value):
+                sql = SQLGenerator().generate_sql(like_rule("starts_with", value))
+                self.assertEqual(sql, f"name LIKE '{pattern}%' ESCAPE '!'")
+
+    def test_ends_with(self):
+        for value, pattern in self.CASES:
+            with self.subTest(value=value):
+                sql = SQLGenerator().generate_sql(like_rule("ends_with", value))
+                self.assertEqual(sql, f"name LIKE '%{pattern}' ESCAPE '!'")
+
+    def test_compiled_patterns(self):
+        for operator in ("starts_with", "ends_with"):
+            generator = SQLGenerator()
+            compiled = generator.compile(like_rule(operator, "x"))
+            for value, _ in self.CASES:
+                with self.subTest(operator=operator, value=value):
+                    self.assertEqual(compiled([value]), generator.generate_sql(like_rule(operator, value)))
+
+
+# Deeper than the default interpreter recursion limit (1000)
+DEPTH = 10000
+
+
+def rule(field, value):
+    return {
+        "type": "rule",
+        "properties": {"operator": "equal", "field": field, "value": [value], "valueType": ["number"]},
+    }
+
+
+def nested_tree(depth):
+    """Build groups nested depth levels deep, each holding a rule and the next group."""
+    tree = rule("leaf", 0)
+    for i in range(depth):
+        tree = {"type": "group", "properties": {"conjunction": "AND"}, "children1": [rule(f"f{i}", i), tree]}
+    return tree
+
+
+class DeepNestingTest(unittest.TestCase):
+    """SQL generation must not recurse per nesting level."""
+
+    def test_generate_sql_deep_groups(self):
+        sql = SQLGenerator().generate_sql(nested_tree(DEPTH))
+        self.assertTrue(sql.startswith(f"(f{DEPTH - 1} = {DEPTH - 1} AND ("))
+        self.assertTrue(sql.endswith("leaf = 0" + ")" * DEPTH))
+
+    def test_compile_deep_groups(self):
+        tree = nested_tree(DEPTH)
+        generator = SQLGenerator()
+        expected = generator.generate_sql(tree)
+        # One slot per rule, in tree order: outermost group first, leaf last
+        values = list(range(DEPTH - 1, -1, -1)) + [0]
+        self.assertEqual(generator.compile(tree)(values), expected)
+
+    def test_deeply_nested_value_array(self):
+        value = 1
+        for _ in range(DEPTH):
+            value = [value, 2]
+        sql = SQLGenerator().format_value(value)
+        self.assertEqual(sql, "(" * DEPTH + "1" + ", 2)" * DEPTH)
+
+
+if __name__ == "__main__":
+    unittest.main()
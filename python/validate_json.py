@@ -6,20 +6,34 @@ This script validates one or more JSON files against a JSON Schema and logs any
 It supports wildcard pattern matching for the source path.
 
 Usage:
-    python json_validator.py --source_path <path> --schema_path <schema> --log_file <log>
+    python json_validator.py --source_path <path> --schema_path <schema> --log_file <log> [--jobs <n>] [--verbose]
 
     --source_path: Path to a JSON file or directory (supports wildcard patterns)
     --schema_path: Path to the JSON schema file
     --log_file: Path to the log file where validation errors will be recorded
+    --jobs: Number of worker processes validating files in parallel (0 = one per CPU)
+    --verbose: Also log a "Validating <file>" message before each file
+
+If the optional fastjsonschema package is installed, the schema is compiled
+into a Python validate function, cached on disk for later runs; otherwise
+jsonschema is used. Files are parsed with orjson when it is installed; as
+orjson is limited to 64-bit integers, documents that may contain larger ones
+are parsed with json so they keep full precision. With ijson installed, files
+larger than STREAM_THRESHOLD_BYTES are streamed and validated one array
+element at a time when the schema describes a top-level array.
 """
 
 import argparse
 import glob
+import hashlib
 import json
 import logging
 import os
+import re
 import sys
-from typing import List, Dict, Any, Union
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union
 
 try:
     import jsonschema
@@ -28,22 +42,73 @@ except ImportError:
     print("Please install it using: pip install jsonschema")
     sys.exit(1)
 
+# Schema drafts fastjsonschema implements; others always use jsonschema
+FAST_SCHEMA_DRAFTS = (jsonschema.Draft4Validator, jsonschema.Draft6Validator, jsonschema.Draft7Validator)
+
+# fastjsonschema options matching jsonschema.validate, which ignores "format"
+# and never writes schema defaults into the validated document
+FAST_COMPILE_OPTIONS = {'use_formats': False, 'use_default': False}
+
+try:
+    import fastjsonschema
+    from fastjsonschema.ref_resolver import RefResolver
+    FAST_VALIDATION_ERRORS = (fastjsonschema.JsonSchemaValueException,)
+except ImportError:
+    # Optional: fall back to the jsonschema validator
+    fastjsonschema = None
+    FAST_VALIDATION_ERRORS = ()
 
-def setup_logging(log_file: str) -> logging.Logger:
-    """Set up logging to file and console."""
+try:
+    import orjson
+except ImportError:
+    # Optional: fall back to the standard json parser
+    orjson = None
+
+# orjson only handles 64-bit integers (older versions silently parse larger
+# ones as floats); documents with a run of 19+ digits are parsed with json
+LONG_DIGITS_PATTERN = re.compile(rb'\d{19,}')
+
+try:
+    import ijson
+except ImportError:
+    # Optional: large files are then loaded whole
+    ijson = None
+
+# Files above this size are streamed element by element when the schema
+# describes a top-level array (requires ijson)
+STREAM_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+# Generated fastjsonschema validators are cached here, keyed by schema hash
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                         'json_validator')
+
+# File extension of JSON files, matched case-insensitively
+JSON_SUFFIX = '.json'
+
+# Root keywords an array items subschema may need for resolving references
+SCHEMA_ROOT_KEYWORDS = ('$schema', '$id', '$defs', 'definitions')
+
+# Root keywords that streaming one element at a time fully honours; a schema
+# with any other root keyword (maxItems, allOf, ...) is validated whole
+STREAMABLE_SCHEMA_KEYWORDS = frozenset(SCHEMA_ROOT_KEYWORDS) | {'type', 'items', 'title', 'description', '$comment'}
+
+
+def setup_logging(log_file: str, verbose: bool = False) -> logging.Logger:
+    """Set up logging to file and console; verbose adds per-file progress messages."""
+    level = logging.DEBUG if verbose else logging.INFO
     logger = logging.getLogger('json_validator')
-    logger.setLevel(logging.INFO)
+    logger.setLevel(level)
     
     # File handler
     file_handler = logging.FileHandler(log_file, mode='w')
-    file_handler.setLevel(logging.INFO)
+    file_handler.setLevel(level)
     
     # Console handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(level)
     
-    # Format
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    # Format (time of day only, cheaper than the default ISO timestamp)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
@@ -55,8 +120,23 @@ def setup_logging(log_file: str) -> logging.Logger:
 
 
 def load_json_file(file_path: str) -> Union[Dict[str, Any], List[Any]]:
-    """Load and parse a JSON file."""
+    """
+    Load and parse a JSON file.
+    
+    orjson is used when installed, except for documents that may contain
+    integers beyond 64 bits, which only json parses exactly. Documents orjson
+    rejects (NaN, Infinity, lone surrogates) are retried with json.
+    """
     try:
+        if orjson is not None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            if LONG_DIGITS_PATTERN.search(data):
+                return json.loads(data)
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                return json.loads(data)
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except json.JSONDecodeError as e:
@@ -65,10 +145,30 @@ def load_json_file(file_path: str) -> Union[Dict[str, Any], List[Any]]:
         raise ValueError(f"Failed to load {file_path}: {str(e)}")
 
 
+def iter_json_files(root: str) -> Iterator[str]:
+    """
+    Recursively yield .json files under a directory, skipping hidden directories.
+    
+    Only the last five characters of a name are lowercased for the suffix check.
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        # Unreadable directories are skipped, as os.walk does
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.'):
+                    yield from iter_json_files(entry.path)
+            elif entry.name[-5:].lower() == JSON_SUFFIX and entry.is_file():
+                yield entry.path
+
+
 def get_json_files(source_path: str) -> List[str]:
     """Get list of JSON files from source path, supporting wildcard patterns."""
     if os.path.isfile(source_path):
-        return [source_path] if source_path.lower().endswith('.json') else []
+        return [source_path] if source_path[-5:].lower() == JSON_SUFFIX else []
     
     # Handle directory with potential wildcards
     files = []
@@ -77,41 +177,245 @@ def get_json_files(source_path: str) -> List[str]:
     if '*' in source_path:
         files = glob.glob(source_path)
         # Keep only .json files
-        files = [f for f in files if os.path.isfile(f) and f.lower().endswith('.json')]
+        files = [f for f in files if f[-5:].lower() == JSON_SUFFIX and os.path.isfile(f)]
     else:
         # It's a directory without wildcards
         if os.path.isdir(source_path):
             # Get all .json files in the directory
-            for root, _, filenames in os.walk(source_path):
-                for filename in filenames:
-                    if filename.lower().endswith('.json'):
-                        files.append(os.path.join(root, filename))
+            files = list(iter_json_files(source_path))
     
     return files
 
 
+def compile_fast_validator(schema: Dict[str, Any]) -> Any:
+    """
+    Compile a schema with fastjsonschema, reusing generated code from earlier runs.
+    
+    The generated module source is cached under CACHE_DIR by a hash of the
+    schema, the fastjsonschema version and the compile options. A missing,
+    unreadable or corrupted cache entry is regenerated and rewritten; cache
+    problems only cost the cache, never the validation.
+    """
+    key_bytes = json.dumps([fastjsonschema.VERSION, FAST_COMPILE_OPTIONS, schema], sort_keys=True).encode('utf-8')
+    digest = hashlib.sha256(key_bytes).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, digest + '.py')
+    
+    # The generated entry function is named after the schema's $id, if any
+    entry_name = RefResolver.from_schema(schema, store={}).get_scope_name()
+    
+    def load_validator(code: str) -> Any:
+        namespace = {}
+        exec(compile(code, cache_path, 'exec'), namespace)
+        return namespace[entry_name]
+    
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return load_validator(f.read())
+    except Exception:
+        # Missing, unreadable or corrupted cache entry: regenerate it below
+        pass
+    
+    code = fastjsonschema.compile_to_code(schema, **FAST_COMPILE_OPTIONS)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so readers never see partial code
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(code)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Do not leave the partial temporary file behind
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    except OSError:
+        pass
+    
+    return load_validator(code)
+
+
+def build_validator(schema: Dict[str, Any]) -> Any:
+    """
+    Check the schema once and build a validator reusable across files.
+    
+    Uses a fastjsonschema generated validate function when the package is
+    installed and implements the schema's draft (4, 6 or 7), otherwise a
+    jsonschema validator.
+    """
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    
+    if fastjsonschema is not None and validator_cls in FAST_SCHEMA_DRAFTS:
+        try:
+            return compile_fast_validator(schema)
+        except fastjsonschema.JsonSchemaDefinitionException:
+            pass
+    
+    return validator_cls(schema)
+
+
+def build_item_validator(schema: Dict[str, Any]) -> Any:
+    """
+    Build a validator for the elements of a top-level array schema.
+    
+    Returns None when the schema does not describe an array of uniformly
+    typed items, constrains the array itself (any root keyword outside
+    STREAMABLE_SCHEMA_KEYWORDS), or ijson is not installed, i.e. when files
+    cannot be streamed.
+    """
+    if (ijson is None or schema.get('type') != 'array' or not isinstance(schema.get('items'), dict)
+            or not STREAMABLE_SCHEMA_KEYWORDS.issuperset(schema)):
+        return None
+    
+    item_schema = {key: schema[key] for key in SCHEMA_ROOT_KEYWORDS if key in schema}
+    item_schema.update(schema['items'])
+    return build_validator(item_schema)
+
+
+def format_error_path(parts: Any) -> str:
+    """Describe where in a document a validation error occurred."""
+    path = '/'.join(str(p) for p in parts)
+    if not path:
+        return "(root level)"
+    return f"at path '{path}'"
+
+
+def find_validation_error(json_data: Union[Dict[str, Any], List[Any]], 
+                          validator: Any) -> Optional[Tuple[List[Any], str]]:
+    """Return the document path and message of a validation error, or None if valid."""
+    if callable(validator):
+        try:
+            validator(json_data)
+            return None
+        except FAST_VALIDATION_ERRORS as e:
+            # Drop the leading "data" name fastjsonschema gives the document root
+            return e.path[1:], e.message
+    
+    # Check pass/fail first so valid documents never build error objects
+    if validator.is_valid(json_data):
+        return None
+    # Report the error the module-level jsonschema.validate() raises (the best
+    # match), not the first one Validator.validate() would raise
+    error = jsonschema.exceptions.best_match(validator.iter_errors(json_data))
+    return list(error.absolute_path), error.message
+
+
 def validate_json_against_schema(json_data: Union[Dict[str, Any], List[Any]], 
-                                schema: Dict[str, Any], 
+                                validator: Any, 
                                 file_path: str, 
                                 logger: logging.Logger) -> bool:
-    """Validate JSON data against a schema."""
+    """Validate JSON data using a prebuilt schema validator."""
     try:
-        jsonschema.validate(instance=json_data, schema=schema)
+        error = find_validation_error(json_data, validator)
+    except Exception as e:
+        logger.error(f"Unexpected error validating {file_path}: {str(e)}")
+        return False
+    
+    if error is None:
         logger.info(f"Validation successful: {file_path}")
         return True
-    except jsonschema.exceptions.ValidationError as e:
-        # Get the path in the document where the error occurred
-        path = '/'.join(str(p) for p in e.absolute_path)
-        if not path:
-            path = "(root level)"
-        else:
-            path = f"at path '{path}'"
+    
+    # Get the path in the document where the error occurred
+    parts, message = error
+    logger.error(f"Validation error in {file_path} {format_error_path(parts)}: {message}")
+    return False
 
-        logger.error(f"Validation error in {file_path} {path}: {e.message}")
+
+def is_large_json_array(file_path: str) -> bool:
+    """Check whether a file is above the streaming threshold and holds a JSON array."""
+    if os.path.getsize(file_path) <= STREAM_THRESHOLD_BYTES:
         return False
+    with open(file_path, 'rb') as f:
+        return f.read(4096).lstrip().startswith(b'[')
+
+
+def validate_json_stream(file_path: str, item_validator: Any, logger: logging.Logger) -> bool:
+    """Validate a top-level JSON array element by element without loading it whole."""
+    try:
+        with open(file_path, 'rb') as f:
+            for index, item in enumerate(ijson.items(f, 'item', use_float=True)):
+                error = find_validation_error(item, item_validator)
+                if error is not None:
+                    parts, message = error
+                    path = format_error_path([index] + list(parts))
+                    logger.error(f"Validation error in {file_path} {path}: {message}")
+                    return False
+    except ijson.JSONError as e:
+        raise ValueError(f"Invalid JSON in {file_path}: {str(e)}")
+    except OSError as e:
+        raise ValueError(f"Failed to load {file_path}: {str(e)}")
     except Exception as e:
         logger.error(f"Unexpected error validating {file_path}: {str(e)}")
         return False
+    
+    logger.info(f"Validation successful: {file_path}")
+    return True
+
+
+def validate_file(file_path: str, validator: Any, logger: logging.Logger,
+                  item_validator: Any = None) -> bool:
+    """
+    Load a JSON file and validate it, logging the outcome.
+    
+    Large top-level arrays are streamed through item_validator when given.
+    """
+    try:
+        logger.debug("Validating %s", file_path)
+        if item_validator is not None and is_large_json_array(file_path):
+            return validate_json_stream(file_path, item_validator, logger)
+        json_data = load_json_file(file_path)
+        return validate_json_against_schema(json_data, validator, file_path, logger)
+    except (ValueError, OSError) as e:
+        logger.error(str(e))
+        return False
+
+
+class RecordCollector(logging.Handler):
+    """Collect log messages in a worker process so the parent can emit them."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.levelno, record.getMessage()))
+
+
+# Per-process state of pool workers, set up by init_worker
+_worker_validator = None
+_worker_item_validator = None
+_worker_logger = None
+_worker_collector = None
+
+
+def init_worker(schema: Dict[str, Any], verbose: bool = False) -> None:
+    """Build the validator and a collecting logger once per worker process."""
+    global _worker_validator, _worker_item_validator, _worker_logger, _worker_collector
+    _worker_validator = build_validator(schema)
+    _worker_item_validator = build_item_validator(schema)
+    _worker_collector = RecordCollector()
+    _worker_logger = logging.getLogger('json_validator.worker')
+    _worker_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    _worker_logger.propagate = False
+    _worker_logger.addHandler(_worker_collector)
+
+
+def validate_file_in_worker(file_path: str) -> Tuple[bool, List[Tuple[int, str]]]:
+    """Validate one file in a worker, returning the result and its log messages."""
+    _worker_collector.records = []
+    is_valid = validate_file(file_path, _worker_validator, _worker_logger, _worker_item_validator)
+    return is_valid, _worker_collector.records
+
+
+def non_negative_int(value: str) -> int:
+    """argparse type for --jobs: an integer that is zero or more."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
 
 
 def main():
@@ -122,11 +426,15 @@ def main():
                         help='Path to the JSON schema file')
     parser.add_argument('--log_file', required=True, 
                         help='Path to the log file')
+    parser.add_argument('--jobs', type=non_negative_int, default=1,
+                        help='Number of worker processes (0 = one per CPU, default: 1)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Also log each file before it is validated')
     
     args = parser.parse_args()
     
     # Set up logging
-    logger = setup_logging(args.log_file)
+    logger = setup_logging(args.log_file, args.verbose)
     logger.info(f"Starting JSON validation")
     logger.info(f"Source path: {args.source_path}")
     logger.info(f"Schema path: {args.schema_path}")
@@ -146,23 +454,27 @@ def main():
         logger.info(f"Found {len(json_files)} JSON file(s) to validate")
         
         # Validate each file
-        valid_count = 0
-        error_count = 0
+        jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
         
-        for file_path in json_files:
-            try:
-                logger.info(f"Validating {file_path}")
-                json_data = load_json_file(file_path)
-                
-                if validate_json_against_schema(json_data, schema, file_path, logger):
-                    valid_count += 1
-                else:
-                    error_count += 1
-                    
-            except ValueError as e:
-                logger.error(str(e))
-                error_count += 1
-                continue
+        if jobs == 1 or len(json_files) == 1:
+            # Build the validators once and reuse them for every file
+            validator = build_validator(schema)
+            item_validator = build_item_validator(schema)
+            results = [validate_file(file_path, validator, logger, item_validator) for file_path in json_files]
+        else:
+            # Each worker builds its own validator, compiled ones cannot be pickled;
+            # check the schema here so an invalid one is reported, not a broken pool
+            jsonschema.validators.validator_for(schema).check_schema(schema)
+            results = []
+            with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                                     initargs=(schema, args.verbose)) as executor:
+                for is_valid, records in executor.map(validate_file_in_worker, json_files, chunksize=8):
+                    for level, message in records:
+                        logger.log(level, message)
+                    results.append(is_valid)
+        
+        valid_count = results.count(True)
+        error_count = len(results) - valid_count
         
         # Summary
         logger.info(f"Validation complete. {valid_count} valid file(s), {error_count} file(s) with errors")